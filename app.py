@@ -1,12 +1,17 @@
 import streamlit as st
 import numpy as np
-import tensorflow as tf
 from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder
 import pandas as pd
-import pickle
+import os
+import tempfile
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
+from ensemble import DEFAULT_INTERVAL, ensemble_predict, load_ensemble
+from export import EXPORT_FORMATS, iter_prediction_chunks, read_chunks, stream_export
+from inference import InferenceExecutor, configure_tf_threads
+from scoring import encode_features, load_artifacts
+from threshold import load_threshold
 
 # Page configuration
 st.set_page_config(
@@ -95,34 +100,42 @@ st.markdown("""
 # Load model and encoders
 @st.cache_resource
 def load_model_and_encoders():
-    model = tf.keras.models.load_model('model.h5')
-    
-    with open('label_encoder_gender.pkl', 'rb') as file:
-        label_encoder_gender = pickle.load(file)
-    
-    with open('onehot_encoder_geo.pkl', 'rb') as file:
-        onehot_encoder_geo = pickle.load(file)
-    
-    with open('scaler.pkl', 'rb') as file:
-        scaler = pickle.load(file)
-    
-    return model, label_encoder_gender, onehot_encoder_geo, scaler
+    configure_tf_threads()
+    return load_artifacts()
+
+# One executor per process: owns the model and batches requests from all sessions
+@st.cache_resource
+def load_inference_executor():
+    return InferenceExecutor(load_model_and_encoders()[0])
+
+@st.cache_resource
+def load_ensemble_weights():
+    return load_ensemble()
 
 model, label_encoder_gender, onehot_encoder_geo, scaler = load_model_and_encoders()
+ensemble = load_ensemble_weights()
+inference_executor = load_inference_executor()
+
+# Decision threshold tuned by threshold.py (falls back to 0.5 when not tuned yet)
+decision_threshold = load_threshold()
+
+# Larger batch exports are not offered as in-app downloads; use export.py instead
+MAX_DOWNLOAD_MB = 200
 
 # Sidebar navigation
 st.sidebar.title("Navigation")
 page = st.sidebar.radio(
     "Select Page",
-    ["Home", "Prediction", "SHAP Analysis", "Analytics", "About"]
+    ["Home", "Prediction", "SHAP Analysis", "Analytics", "Batch Export", "About"]
 )
 
 st.sidebar.markdown("---")
-st.sidebar.markdown("""
+st.sidebar.markdown(f"""
 ### Quick Info
 • **Model Type**: Neural Network  
 • **Accuracy**: ~86%  
 • **Features**: 12  
+• **Decision Threshold**: {decision_threshold:.2f}  
 • **Last Updated**: Feb 2026
 """)
 
@@ -292,7 +305,8 @@ elif page == "Prediction":
         # Prepare input data
         input_data = pd.DataFrame({
             'CreditScore': [credit_score],
-            'Gender': [label_encoder_gender.transform([gender])[0]],
+            'Geography': [geography],
+            'Gender': [gender],
             'Age': [age],
             'Tenure': [tenure],
             'Balance': [balance],
@@ -302,25 +316,26 @@ elif page == "Prediction":
             'EstimatedSalary': [estimated_salary]
         })
         
-        # One-hot encode Geography
-        geo_encoded = onehot_encoder_geo.transform([[geography]]).toarray()
-        geo_encoded_df = pd.DataFrame(geo_encoded, columns=onehot_encoder_geo.get_feature_names_out(['Geography']))
-        
-        # Combine data
-        input_data = pd.concat([input_data.reset_index(drop=True), geo_encoded_df], axis=1)
-        
-        # Scale data
-        input_data_scaled = scaler.transform(input_data)
+        # Encode and scale with the same helper the batch tools use
+        input_data_scaled = encode_features(input_data, label_encoder_gender, onehot_encoder_geo, scaler)
         
         # Make prediction
-        prediction = model.predict(input_data_scaled, verbose=0)
+        prediction = inference_executor.predict(input_data_scaled)
         prediction_proba = prediction[0][0]
         
+        # The bootstrap ensemble (ensemble.py) gives its own mean and interval; the
+        # probability and risk label above stay on model.h5, which the threshold is tuned on
+        ensemble_estimate = None
+        if ensemble is not None:
+            mean, lower, upper = ensemble_predict(input_data_scaled, ensemble)
+            ensemble_estimate = (float(mean[0]), float(lower[0]), float(upper[0]))
+        
         # Store in session state for SHAP analysis
         st.session_state.last_prediction = {
             'input_data': input_data,
             'input_scaled': input_data_scaled,
             'probability': prediction_proba,
+            'ensemble_estimate': ensemble_estimate,
             'customer_info': {
                 'geography': geography,
                 'gender': gender,
@@ -339,42 +354,52 @@ elif page == "Prediction":
         st.markdown("### Prediction Results")
         
         # Display prediction with visual styling
-        risk_class = "high-risk" if prediction_proba > 0.5 else "low-risk"
-        risk_text = "High Risk" if prediction_proba > 0.5 else "Low Risk"
-        risk_icon = "⚠" if prediction_proba > 0.5 else "✓"
+        risk_class = "high-risk" if prediction_proba > decision_threshold else "low-risk"
+        risk_text = "High Risk" if prediction_proba > decision_threshold else "Low Risk"
+        risk_icon = "⚠" if prediction_proba > decision_threshold else "✓"
         
         st.markdown(f"""
         <div class="prediction-box {risk_class}">
             <h1>{risk_icon} {risk_text}</h1>
             <h2>Churn Probability: {prediction_proba:.1%}</h2>
+            {f'<p>Ensemble mean: {ensemble_estimate[0]:.1%} ({DEFAULT_INTERVAL:.0%} interval: {ensemble_estimate[1]:.1%} – {ensemble_estimate[2]:.1%})</p>' if ensemble_estimate else ''}
             <p style="font-size: 1.2rem; margin-top: 1rem;">
-                {'This customer is likely to churn. Immediate action recommended.' if prediction_proba > 0.5 else 'This customer is likely to stay. Continue current engagement.'}
+                {'This customer is likely to churn. Immediate action recommended.' if prediction_proba > decision_threshold else 'This customer is likely to stay. Continue current engagement.'}
             </p>
         </div>
         """, unsafe_allow_html=True)
         
         # Gauge chart
+        gauge_steps = [
+            {'range': [0, 30], 'color': '#51cf66'},
+            {'range': [30, 70], 'color': '#ffd43b'},
+            {'range': [70, 100], 'color': '#ff6b6b'}
+        ]
+        gauge_title = "Churn Risk Score"
+        if ensemble_estimate:
+            # Shade the ensemble's interval over the risk bands; the needle stays on model.h5
+            mean, lower, upper = ensemble_estimate
+            gauge_steps.append({'range': [lower * 100, upper * 100], 'color': 'rgba(31,119,180,0.45)', 'thickness': 0.5})
+            gauge_title += (f"<br><span style='font-size: 0.7em'>Ensemble mean {mean:.1%}, "
+                            f"{DEFAULT_INTERVAL:.0%} interval {lower:.1%} – {upper:.1%}</span>")
+        
         fig = go.Figure(go.Indicator(
             mode="gauge+number+delta",
             value=prediction_proba * 100,
             domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Churn Risk Score", 'font': {'size': 24}},
-            delta={'reference': 50, 'increasing': {'color': "red"}, 'decreasing': {'color': "green"}},
+            title={'text': gauge_title, 'font': {'size': 24}},
+            delta={'reference': decision_threshold * 100, 'increasing': {'color': "red"}, 'decreasing': {'color': "green"}},
             gauge={
                 'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
                 'bar': {'color': "darkblue"},
                 'bgcolor': "white",
                 'borderwidth': 2,
                 'bordercolor': "gray",
-                'steps': [
-                    {'range': [0, 30], 'color': '#51cf66'},
-                    {'range': [30, 70], 'color': '#ffd43b'},
-                    {'range': [70, 100], 'color': '#ff6b6b'}
-                ],
+                'steps': gauge_steps,
                 'threshold': {
                     'line': {'color': "red", 'width': 4},
                     'thickness': 0.75,
-                    'value': 50
+                    'value': decision_threshold * 100
                 }
             }
         ))
@@ -391,7 +416,7 @@ elif page == "Prediction":
         # Recommendations
         st.markdown("### Recommendations")
         
-        if prediction_proba > 0.5:
+        if prediction_proba > decision_threshold:
             st.error("**High Churn Risk Detected!**")
             st.markdown("""
             #### Immediate Actions:
@@ -443,7 +468,7 @@ elif page == "SHAP Analysis":
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric("Churn Probability", f"{probability:.1%}", 
-                     delta=f"{(probability - 0.5):.1%}" if probability > 0.5 else f"{(0.5 - probability):.1%}",
+                     delta=f"{(probability - decision_threshold):.1%}" if probability > decision_threshold else f"{(decision_threshold - probability):.1%}",
                      delta_color="inverse")
         with col2:
             st.metric("Customer Age", f"{customer_info['age']} years")
@@ -786,6 +811,96 @@ elif page == "Analytics":
     except Exception as e:
         st.error(f"Error loading analytics data: {str(e)}")
 
+# BATCH EXPORT PAGE
+elif page == "Batch Export":
+    st.title("Batch Predictions Export")
+    st.markdown("### Score a customer file and download predictions with insights")
+    
+    uploaded_file = st.file_uploader("Customer file (same columns as Churn_Modelling.csv)", type=['csv', 'parquet'])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        export_format = st.selectbox('Export Format', list(EXPORT_FORMATS))
+    with col2:
+        chunk_size = st.number_input('Rows per Chunk', 1000, 1000000, 100000, step=10000,
+                                     help="Rows scored and written at a time; bounds server memory")
+    
+    if uploaded_file is not None and st.button("Generate Export", use_container_width=True):
+        stats = {'rows': 0, 'high_risk': 0}
+        progress = st.empty()
+        
+        def track(chunks):
+            for chunk in chunks:
+                stats['rows'] += len(chunk)
+                stats['high_risk'] += int(chunk['churn_prediction'].sum())
+                progress.info(f"Scored {stats['rows']:,} customers...")
+                yield chunk
+        
+        # Scored chunks are written to disk as they arrive, so only one chunk is held in memory
+        predictions = iter_prediction_chunks(
+            read_chunks(uploaded_file, int(chunk_size)),
+            (model, label_encoder_gender, onehot_encoder_geo, scaler),
+            ensemble=ensemble,
+            threshold=decision_threshold,
+            executor=inference_executor
+        )
+        # One temporary directory per session, removed when the session's state is dropped
+        if 'batch_export_dir' not in st.session_state:
+            st.session_state.batch_export_dir = tempfile.TemporaryDirectory(prefix='churn-export-')
+        if 'batch_export' in st.session_state:
+            if os.path.exists(st.session_state.batch_export['path']):
+                os.remove(st.session_state.batch_export['path'])
+            del st.session_state.batch_export
+        export_path = os.path.join(st.session_state.batch_export_dir.name, f"predictions.{export_format}")
+        too_large = False
+        with open(export_path, 'wb') as export_file:
+            for data in stream_export(track(predictions), export_format):
+                export_file.write(data)
+                if export_file.tell() > MAX_DOWNLOAD_MB * 1024 * 1024:
+                    too_large = True
+                    break
+        progress.empty()
+        
+        if too_large:
+            os.remove(export_path)
+            st.warning(f"This export is larger than the {MAX_DOWNLOAD_MB} MB in-app download limit. "
+                       f"Run `python export.py customers.csv predictions.{export_format}` on the server instead.")
+        else:
+            st.session_state.batch_export = {
+                'path': export_path,
+                'format': export_format,
+                'rows': stats['rows'],
+                'high_risk': stats['high_risk']
+            }
+    
+    if 'batch_export' in st.session_state:
+        export = st.session_state.batch_export
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Customers Scored", f"{export['rows']:,}")
+        with col2:
+            st.metric("High Risk", f"{export['high_risk']:,}")
+        with col3:
+            st.metric("High Risk Share", f"{export['high_risk'] / max(export['rows'], 1):.1%}")
+        
+        export_mb = os.path.getsize(export['path']) / (1024 * 1024)
+        
+        def read_export(path=export['path']):
+            with open(path, 'rb') as file:
+                return file.read()
+        
+        # A callable is only read when the button is clicked, not on every rerun
+        st.download_button(
+            f"Download Predictions ({export_mb:.1f} MB)",
+            data=read_export,
+            file_name=f"churn_predictions_{datetime.now():%Y%m%d_%H%M%S}.{export['format']}",
+            mime=EXPORT_FORMATS[export['format']],
+            use_container_width=True
+        )
+        
+        st.info("**Tip**: For files with millions of rows, run `python export.py customers.csv predictions.csv.gz` on the server to skip the upload/download limits.")
+
 # ABOUT PAGE
 elif page == "About":
     st.title("About This Application")
@@ -0,0 +1,176 @@
+"""
+Two-tier cascade scoring for large nightly rescoring runs.
+
+A logistic-regression tier, fitted on the same encoded and scaled features
+the app produces, scores every customer first. Only customers whose cheap
+score falls inside the uncertainty band are sent to the Keras model; the
+rest keep their linear score. The band is centred on the tuned decision
+threshold so every row near the decision boundary reaches the ANN, and by
+default is sized to route a fixed fraction of customers: the tuned threshold
+sits far from 0.5, so a fixed width would route wildly different shares.
+
+Usage:
+    python cascade.py --fit                      # train and save cascade_lr.pkl
+    python cascade.py --route-fraction 0.3       # report routing, speed-up and agreement
+    python cascade.py --width 0.1                # same, with a fixed band width
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from threshold import holdout_split, load_threshold
+
+LINEAR_TIER_PATH = 'cascade_lr.pkl'
+REFERENCE_DATA = 'Churn_Modelling.csv'
+DEFAULT_ROUTE_FRACTION = 0.3
+
+
+def fit_linear_tier(df, label_encoder_gender, onehot_encoder_geo, scaler, path=LINEAR_TIER_PATH):
+    """Fit the logistic-regression tier on the notebook's training rows and save it."""
+    from scoring import encode_features
+
+    # Hold out the same 20% the ANN never trained on
+    train = df.drop(holdout_split(df).index)
+    X_train = encode_features(train, label_encoder_gender, onehot_encoder_geo, scaler)
+
+    linear_model = LogisticRegression(max_iter=1000)
+    linear_model.fit(X_train, train['Exited'].values)
+
+    with open(path, 'wb') as file:
+        pickle.dump(linear_model, file)
+    return linear_model
+
+
+def load_linear_tier(path=LINEAR_TIER_PATH):
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+def uncertainty_band(threshold=None, width=None, scores=None, fraction=DEFAULT_ROUTE_FRACTION):
+    """
+    Band of linear scores routed to the ANN: the decision threshold +/- a half-width.
+
+    Pass ``width`` for a fixed half-width. Otherwise it is the smallest one
+    that covers the ``fraction`` of linear ``scores`` nearest the threshold.
+    """
+    if threshold is None:
+        threshold = load_threshold()
+    if width is None:
+        if scores is None:
+            raise ValueError("Pass either a band width or linear scores to size the band from")
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError(f"Route fraction must be in (0, 1], got {fraction}")
+        width = float(np.quantile(np.abs(np.asarray(scores) - threshold), fraction))
+    return max(0.0, threshold - width), min(1.0, threshold + width)
+
+
+def reference_band(linear_model, label_encoder_gender, onehot_encoder_geo, scaler, threshold=None,
+                   width=None, fraction=DEFAULT_ROUTE_FRACTION, path=REFERENCE_DATA):
+    """
+    Size the band on the reference customers so it routes ``fraction`` of them.
+
+    The band is then fixed for a whole run, so every chunk and every
+    incremental batch is routed the same way. An explicit ``width`` skips
+    the reference data.
+    """
+    from scoring import encode_features
+
+    if width is not None:
+        return uncertainty_band(threshold, width)
+
+    df = pd.read_csv(path)
+    X = encode_features(df, label_encoder_gender, onehot_encoder_geo, scaler)
+    return uncertainty_band(threshold, scores=linear_model.predict_proba(X)[:, 1], fraction=fraction)
+
+
+def cascade_predict(X, linear_model, model, band=None, threshold=None, batch_size=8192):
+    """
+    Score an encoded feature matrix with the cascade.
+
+    ``band`` must contain the threshold. It defaults to the band that routes
+    DEFAULT_ROUTE_FRACTION of these rows; pass a ``reference_band`` when
+    scoring in chunks so routing doesn't depend on the chunk. Returns the
+    churn probabilities and a boolean mask of the rows that were routed to
+    the Keras model.
+    """
+    if threshold is None:
+        threshold = load_threshold()
+
+    probabilities = linear_model.predict_proba(X)[:, 1].astype(np.float32)
+    if band is None:
+        band = uncertainty_band(threshold, scores=probabilities)
+
+    low, high = band
+    if not 0.0 <= low < high <= 1.0:
+        raise ValueError(f"Uncertainty band must satisfy 0 <= low < high <= 1, got {band}")
+    if not low <= threshold <= high:
+        raise ValueError(f"Uncertainty band {band} does not contain the decision threshold {threshold:.3f}")
+
+    routed = (probabilities >= low) & (probabilities <= high)
+
+    if routed.any():
+        probabilities[routed] = model.predict(X[routed], batch_size=batch_size, verbose=0).ravel()
+    return probabilities, routed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade scoring: logistic regression first, ANN for uncertain rows")
+    parser.add_argument('--data', default='Churn_Modelling.csv')
+    parser.add_argument('--fit', action='store_true', help="Fit and save the linear tier before reporting")
+    parser.add_argument('--route-fraction', type=float, default=DEFAULT_ROUTE_FRACTION,
+                        help="Share of customers, nearest the decision threshold, to route to the ANN")
+    parser.add_argument('--width', type=float, default=None,
+                        help="Fixed half-width of the uncertainty band instead of --route-fraction")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Tile the data this many times for a more stable throughput measurement")
+    args = parser.parse_args()
+
+    from scoring import encode_features, load_artifacts
+
+    model, label_encoder_gender, onehot_encoder_geo, scaler = load_artifacts()
+    df = pd.read_csv(args.data)
+
+    if args.fit:
+        linear_model = fit_linear_tier(df, label_encoder_gender, onehot_encoder_geo, scaler)
+        print(f"Saved linear tier to {LINEAR_TIER_PATH}")
+    else:
+        linear_model = load_linear_tier()
+
+    X = encode_features(df, label_encoder_gender, onehot_encoder_geo, scaler)
+    if args.repeat > 1:
+        X = np.tile(X, (args.repeat, 1))
+
+    # Warm up both paths so neither timing includes graph tracing
+    model.predict(X[:8], verbose=0)
+    linear_model.predict_proba(X[:8])
+
+    start = time.perf_counter()
+    full = model.predict(X, batch_size=8192, verbose=0).ravel()
+    full_seconds = time.perf_counter() - start
+
+    threshold = load_threshold()
+    low, high = uncertainty_band(threshold, args.width, linear_model.predict_proba(X)[:, 1], args.route_fraction)
+
+    start = time.perf_counter()
+    cascaded, routed = cascade_predict(X, linear_model, model, (low, high), threshold)
+    cascade_seconds = time.perf_counter() - start
+
+    agreement = np.mean((full > threshold) == (cascaded > threshold))
+    max_diff = np.max(np.abs(full - cascaded))
+
+    print(f"Rows scored:            {len(X):,}")
+    print(f"Uncertainty band:       [{low:.2f}, {high:.2f}]")
+    print(f"Routed to ANN:          {routed.mean():.1%} ({routed.sum():,} rows)")
+    print(f"Full ANN:               {full_seconds:.3f}s ({len(X) / full_seconds:,.0f} rows/s)")
+    print(f"Cascade:                {cascade_seconds:.3f}s ({len(X) / cascade_seconds:,.0f} rows/s)")
+    print(f"Throughput gain:        {full_seconds / cascade_seconds:.2f}x")
+    print(f"Label agreement @ {threshold:.2f}: {agreement:.2%}")
+    print(f"Max |probability diff|: {max_diff:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Bootstrap ensemble of the 64/32/1 churn ANN with a stacked forward pass.
+
+Each member is trained on a bootstrap resample of the notebook's training
+split. For inference the members' weights are stacked along a leading axis,
+so all N members are evaluated with one batched matrix multiply per layer
+instead of N separate ``model.predict`` calls. The members' mean and
+spread give a separate estimate and uncertainty interval for every customer;
+the headline probability and the tuned decision threshold stay on model.h5.
+
+Usage:
+    python ensemble.py --members 5 --epochs 100
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from threshold import holdout_split
+
+ENSEMBLE_PATH = 'ensemble.npz'
+DEFAULT_INTERVAL = 0.9
+
+
+def build_member(n_features):
+    """Same architecture and optimizer as the model trained in experiments.ipynb."""
+    import tensorflow as tf
+
+    model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(64, activation='relu', input_shape=(n_features,)),
+        tf.keras.layers.Dense(32, activation='relu'),
+        tf.keras.layers.Dense(1, activation='sigmoid')
+    ])
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01),
+                  loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def train_ensemble(df, label_encoder_gender, onehot_encoder_geo, scaler,
+                   n_members=5, epochs=100, seed=42, path=ENSEMBLE_PATH):
+    """Train ``n_members`` bootstrap members and save their stacked weights."""
+    import tensorflow as tf
+
+    from scoring import encode_features
+
+    holdout = holdout_split(df)
+    train = df.drop(holdout.index)
+    X_train = encode_features(train, label_encoder_gender, onehot_encoder_geo, scaler)
+    y_train = train['Exited'].values
+    X_test = encode_features(holdout, label_encoder_gender, onehot_encoder_geo, scaler)
+    y_test = holdout['Exited'].values
+
+    rng = np.random.default_rng(seed)
+    layers = [[] for _ in range(6)]
+
+    for member in range(n_members):
+        tf.keras.utils.set_random_seed(seed + member)
+        sample = rng.integers(0, len(X_train), len(X_train))
+
+        model = build_member(X_train.shape[1])
+        early_stopping_callback = tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss', patience=10, restore_best_weights=True
+        )
+        model.fit(X_train[sample], y_train[sample], validation_data=(X_test, y_test),
+                  epochs=epochs, callbacks=[early_stopping_callback], verbose=0)
+
+        for stack, weights in zip(layers, model.get_weights()):
+            stack.append(weights)
+        print(f"Member {member + 1}/{n_members}: val_accuracy {model.evaluate(X_test, y_test, verbose=0)[1]:.4f}")
+
+    names = ['W1', 'b1', 'W2', 'b2', 'W3', 'b3']
+    weights = {name: np.stack(stack).astype(np.float32) for name, stack in zip(names, layers)}
+    np.savez(path, **weights)
+    return weights
+
+
+def load_ensemble(path=ENSEMBLE_PATH):
+    """Return the stacked ensemble weights, or None if no ensemble has been trained."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def member_probabilities(X, weights):
+    """
+    Evaluate every member on ``X`` in one stacked pass.
+
+    Returns an array of shape (n_members, n_rows).
+    """
+    X = np.asarray(X, dtype=np.float32)
+
+    # (n_members, n_rows, 64) -- X is broadcast against every member's W1
+    hidden = np.maximum(np.matmul(X, weights['W1']) + weights['b1'][:, None, :], 0)
+    # (n_members, n_rows, 32)
+    hidden = np.maximum(np.matmul(hidden, weights['W2']) + weights['b2'][:, None, :], 0)
+    # (n_members, n_rows)
+    logits = np.matmul(hidden, weights['W3'])[..., 0] + weights['b3']
+    return 1 / (1 + np.exp(-logits))
+
+
+def ensemble_predict(X, weights, interval=DEFAULT_INTERVAL, batch_size=65536):
+    """Return the mean churn probability and the lower/upper interval bounds across members."""
+    alpha = (1 - interval) / 2
+    mean = np.empty(len(X), dtype=np.float32)
+    lower = np.empty(len(X), dtype=np.float32)
+    upper = np.empty(len(X), dtype=np.float32)
+
+    # Chunk rows so the (members x rows x 64) activations stay bounded
+    for start in range(0, len(X), batch_size):
+        stop = start + batch_size
+        probabilities = member_probabilities(X[start:stop], weights)
+        mean[start:stop] = probabilities.mean(axis=0)
+        lower[start:stop], upper[start:stop] = np.quantile(probabilities, [alpha, 1 - alpha], axis=0)
+    return mean, lower, upper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a bootstrap ensemble of the churn ANN")
+    parser.add_argument('--data', default='Churn_Modelling.csv')
+    parser.add_argument('--members', type=int, default=5)
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=ENSEMBLE_PATH)
+    args = parser.parse_args()
+
+    from scoring import load_artifacts
+
+    _, label_encoder_gender, onehot_encoder_geo, scaler = load_artifacts()
+    df = pd.read_csv(args.data)
+    train_ensemble(df, label_encoder_gender, onehot_encoder_geo, scaler,
+                   n_members=args.members, epochs=args.epochs, seed=args.seed, path=args.output)
+    print(f"Saved {args.members}-member ensemble to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
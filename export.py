@@ -0,0 +1,184 @@
+"""
+Streaming, chunked export of batch predictions.
+
+Customers are read, scored and serialized one chunk at a time, and the
+serialized bytes are yielded as they are produced, so exporting millions of
+rows never materializes the full prediction table or output file in memory.
+Each row carries the churn probability (plus the ensemble mean and interval
+when available), the risk label and the top attribution features.
+
+Usage:
+    python export.py customers.csv predictions.csv.gz
+    python export.py customers.parquet predictions.parquet --chunk-size 200000
+    python export.py customers.csv predictions.csv.gz --cascade
+"""
+import argparse
+import io
+import zlib
+
+import pandas as pd
+
+from cascade import DEFAULT_ROUTE_FRACTION, load_linear_tier, reference_band
+from ensemble import load_ensemble
+from scoring import load_artifacts, score_customers
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'csv.gz': 'application/gzip',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def read_chunks(source, chunk_size=100000):
+    """Yield DataFrame chunks from a CSV or Parquet path or file object."""
+    name = getattr(source, 'name', source)
+    if str(name).endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        if parquet_file.metadata.num_rows == 0:
+            # iter_batches yields nothing here; one empty chunk still carries the header through
+            yield parquet_file.schema_arrow.empty_table().to_pandas()
+            return
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size)
+
+
+def iter_prediction_chunks(chunks, artifacts, ensemble=None, threshold=None, top_features=3,
+                           linear_tier=None, band=None, executor=None):
+    """
+    Score each chunk of raw customers and yield its prediction DataFrame.
+
+    Pass the app's ``InferenceExecutor`` as ``executor`` to run each chunk's
+    model work on its thread instead of the caller's.
+    """
+    for chunk in chunks:
+        kwargs = dict(threshold=threshold, ensemble=ensemble, top_features=top_features,
+                      linear_tier=linear_tier, band=band)
+        if executor is None:
+            yield score_customers(chunk, *artifacts, **kwargs)
+        else:
+            yield executor.call(score_customers, chunk, *artifacts, **kwargs).result()
+
+
+def stream_csv(predictions, compress=False):
+    """Yield CSV bytes chunk by chunk, optionally gzip-compressed on the fly."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    header = True
+    for chunk in predictions:
+        data = chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be taken out between writes."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_parquet(predictions, compression='snappy'):
+    """Yield Parquet bytes one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _DrainableSink()
+    writer = None
+    for chunk in predictions:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema, compression=compression)
+        writer.write_table(table)
+        data = sink.drain()
+        if data:
+            yield data
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def stream_export(predictions, file_format='csv'):
+    """Serialize prediction chunks in ``file_format`` ('csv', 'csv.gz' or 'parquet')."""
+    if file_format == 'parquet':
+        return stream_parquet(predictions)
+    if file_format in ('csv', 'csv.gz'):
+        return stream_csv(predictions, compress=file_format == 'csv.gz')
+    raise ValueError(f"Unsupported export format: {file_format}")
+
+
+def export_predictions(source, destination, artifacts, ensemble=None, chunk_size=100000, top_features=3,
+                       linear_tier=None, band=None):
+    """
+    Score ``source`` chunk by chunk and stream the results into ``destination``.
+
+    Passing ``linear_tier`` scores with the logistic-regression/ANN cascade.
+    """
+    file_format = next((fmt for fmt in ('csv.gz', 'parquet', 'csv') if destination.endswith(fmt)), 'csv')
+    predictions = iter_prediction_chunks(read_chunks(source, chunk_size), artifacts, ensemble,
+                                         top_features=top_features, linear_tier=linear_tier, band=band)
+    rows = 0
+
+    def counted(chunks):
+        nonlocal rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    with open(destination, 'wb') as file:
+        for data in stream_export(counted(predictions), file_format):
+            file.write(data)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export batch churn predictions in streamed chunks")
+    parser.add_argument('source', help="Customer CSV or Parquet file")
+    parser.add_argument('destination', help="Output path ending in .csv, .csv.gz or .parquet")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--top-features', type=int, default=3, help="Attribution features per row")
+    parser.add_argument('--cascade', action='store_true',
+                        help="Score with the cascade (run `cascade.py --fit` first); only uncertain rows reach the ANN")
+    parser.add_argument('--route-fraction', type=float, default=DEFAULT_ROUTE_FRACTION,
+                        help="Share of reference customers, nearest the decision threshold, the cascade routes to the ANN")
+    parser.add_argument('--band-width', type=float, default=None,
+                        help="Fixed half-width of the cascade's band instead of --route-fraction")
+    args = parser.parse_args()
+
+    artifacts = load_artifacts()
+    linear_tier = band = None
+    if args.cascade:
+        linear_tier = load_linear_tier()
+        # Fixed for the whole export so routing doesn't depend on how the file is chunked
+        band = reference_band(linear_tier, *artifacts[1:], width=args.band_width, fraction=args.route_fraction)
+    rows = export_predictions(args.source, args.destination, artifacts, load_ensemble(),
+                              args.chunk_size, args.top_features, linear_tier, band)
+    print(f"Exported {rows:,} predictions to {args.destination}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Incremental rescoring of a customer snapshot.
+
+Keeps a score table with a content hash of every customer's model input
+fields and the model version that produced the score. Each run diffs the new
+snapshot against that table and only scores customers that are new, whose
+inputs changed, or that were scored by a different model version. Everything
+else is carried over unchanged.
+
+Usage:
+    python incremental.py --snapshot Churn_Modelling.csv --store scores.parquet
+    python incremental.py --snapshot Churn_Modelling.csv --store scores.parquet --cascade
+"""
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cascade import DEFAULT_ROUTE_FRACTION, LINEAR_TIER_PATH, load_linear_tier, reference_band
+from ensemble import ENSEMBLE_PATH, load_ensemble
+from scoring import INPUT_COLUMNS, load_artifacts, risk_labels, score_customers
+from threshold import load_threshold
+
+STORE_PATH = 'scores.parquet'
+
+# Every artifact that can change a customer's score
+MODEL_ARTIFACTS = ['model.h5', 'label_encoder_gender.pkl', 'onehot_encoder_geo.pkl', 'scaler.pkl', ENSEMBLE_PATH]
+
+
+def model_version(paths=MODEL_ARTIFACTS, scorer=''):
+    """Short digest of the model and preprocessing artifacts present on disk plus a scorer description."""
+    digest = hashlib.sha256(scorer.encode('utf-8'))
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def input_hashes(df):
+    """64-bit content hash of each customer's model input fields, as hex strings."""
+    # Canonical dtypes, so an int column read back as float (a NaN, or CSV <-> Parquet) hashes the same
+    canonical = pd.DataFrame({
+        column: df[column].astype(str) if column in ('Geography', 'Gender') else df[column].astype(np.float64)
+        for column in INPUT_COLUMNS
+    })
+    # Strings survive the NaN-introducing merge and CSV round trips that would mangle uint64
+    hashes = pd.util.hash_pandas_object(canonical, index=False)
+    return hashes.map('{:016x}'.format).values
+
+
+def read_table(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def write_table(df, path):
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def rescore_incremental(snapshot, store, artifacts, ensemble=None, threshold=None, batch_size=50000,
+                        linear_tier=None, band=None):
+    """
+    Merge fresh scores for new or changed customers into ``store``.
+
+    ``snapshot`` holds raw customer rows keyed by CustomerId; ``store`` is
+    the previous score table (or None on the first run). Returns the new
+    score table, the number of rows that were rescored and the seconds
+    spent scoring them. Passing ``linear_tier`` scores with the cascade,
+    routing ``band`` (by default cascade.reference_band) to the ANN; the
+    cascade and its band are part of the model version, so switching
+    scorers rescores every row.
+    """
+    if threshold is None:
+        threshold = load_threshold()
+
+    if linear_tier is None:
+        version = model_version()
+    else:
+        if band is None:
+            band = reference_band(linear_tier, *artifacts[1:], threshold=threshold)
+        version = model_version(MODEL_ARTIFACTS + [LINEAR_TIER_PATH], scorer=f"cascade {band[0]:.6f} {band[1]:.6f}")
+
+    snapshot = snapshot.drop_duplicates('CustomerId', keep='last').reset_index(drop=True)
+    hashes = input_hashes(snapshot)
+
+    if store is None or store.empty:
+        needs_scoring = np.ones(len(snapshot), dtype=bool)
+        previous = None
+    else:
+        previous = snapshot[['CustomerId']].merge(store, on='CustomerId', how='left')
+        needs_scoring = (
+            previous['input_hash'].isna().values
+            | (previous['input_hash'].values != hashes)
+            | (previous['model_version'].values != version)
+        )
+
+    changed = np.flatnonzero(needs_scoring)
+    parts = []
+    if previous is not None:
+        # Customers missing from the new snapshot already fell away with the left merge
+        parts.append(previous.loc[~needs_scoring].drop(columns=['input_hash', 'model_version']))
+
+    scored_at = pd.Timestamp.now().isoformat()
+    score_start = time.perf_counter()
+    for start in range(0, len(changed), batch_size):
+        batch = snapshot.iloc[changed[start:start + batch_size]]
+        scores = score_customers(batch, *artifacts, threshold=threshold, ensemble=ensemble,
+                                 linear_tier=linear_tier, band=band)
+        scores['scored_at'] = scored_at
+        parts.append(scores)
+    score_seconds = time.perf_counter() - score_start
+
+    # Both parts are indexed by snapshot position, so sorting restores snapshot order
+    result = pd.concat(parts).sort_index()
+    result['input_hash'] = hashes
+    result['model_version'] = version
+
+    # Labels are cheap, so re-derive them in case the decision threshold was retuned
+    result['churn_prediction'] = (result['churn_probability'].values > threshold).astype(np.int8)
+    result['risk_label'] = risk_labels(result['churn_probability'].values, threshold)
+    return result.reset_index(drop=True), len(changed), score_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score only new or changed customers and merge into the score table")
+    parser.add_argument('--snapshot', default='Churn_Modelling.csv', help="Current customer table")
+    parser.add_argument('--store', default=STORE_PATH, help="Score table (.parquet or .csv) to update")
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--compare-full', action='store_true',
+                        help="Also time a full rescore instead of extrapolating from the incremental run")
+    parser.add_argument('--cascade', action='store_true',
+                        help="Score with the cascade (run `cascade.py --fit` first); only uncertain rows reach the ANN")
+    parser.add_argument('--route-fraction', type=float, default=DEFAULT_ROUTE_FRACTION,
+                        help="Share of reference customers, nearest the decision threshold, the cascade routes to the ANN")
+    parser.add_argument('--band-width', type=float, default=None,
+                        help="Fixed half-width of the cascade's band instead of --route-fraction")
+    args = parser.parse_args()
+
+    artifacts = load_artifacts()
+    ensemble = load_ensemble()
+    linear_tier = band = None
+    if args.cascade:
+        linear_tier = load_linear_tier()
+        band = reference_band(linear_tier, *artifacts[1:], width=args.band_width, fraction=args.route_fraction)
+    snapshot = read_table(args.snapshot)
+    store = read_table(args.store) if os.path.exists(args.store) else None
+
+    start = time.perf_counter()
+    result, rescored, score_seconds = rescore_incremental(snapshot, store, artifacts, ensemble,
+                                                         batch_size=args.batch_size, linear_tier=linear_tier,
+                                                         band=band)
+    write_table(result, args.store)
+    elapsed = time.perf_counter() - start
+
+    skipped = len(result) - rescored
+    print(f"Customers in snapshot: {len(result):,}")
+    print(f"Rescored:              {rescored:,}")
+    print(f"Skipped (unchanged):   {skipped:,} ({skipped / max(len(result), 1):.1%})")
+    print(f"Incremental run:       {elapsed:.2f}s")
+
+    if args.compare_full:
+        start = time.perf_counter()
+        score_customers(snapshot, *artifacts, ensemble=ensemble, linear_tier=linear_tier, band=band)
+        full_seconds = time.perf_counter() - start
+        print(f"Full rescore:          {full_seconds:.2f}s")
+        print(f"Time saved:            {full_seconds - elapsed:.2f}s")
+    elif rescored:
+        # Extrapolate from the per-row scoring cost of this run
+        full_seconds = score_seconds / rescored * len(result)
+        print(f"Full rescore (est.):   {full_seconds:.2f}s")
+        print(f"Time saved (est.):     {full_seconds - elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
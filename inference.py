@@ -0,0 +1,168 @@
+"""
+Process-wide inference executor shared by all Streamlit sessions.
+
+A single worker thread owns the Keras model. Sessions submit encoded rows
+from their own script threads and get a Future back; requests that arrive
+within a few milliseconds of each other are concatenated into one forward
+pass and the results split back out. Batches go through the warmed serving
+function from serving.py instead of ``model.predict``, avoiding Keras's
+per-call loop setup, which dominates on one-row inputs. Other model work,
+such as scoring batch-export chunks, is queued with ``call`` so it also
+runs on the executor's thread.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import tensorflow as tf
+
+from serving import predict_direct, warm_up
+
+
+def configure_tf_threads(intra_op_threads=None, inter_op_threads=1):
+    """
+    Cap the threads TensorFlow uses so concurrent sessions don't oversubscribe the host.
+
+    Must run before TensorFlow executes anything; later calls are ignored.
+    Defaults to half the CPUs, overridable with CHURN_TF_INTRA_OP_THREADS.
+    """
+    if intra_op_threads is None:
+        intra_op_threads = int(os.environ.get('CHURN_TF_INTRA_OP_THREADS', 0)) or max(1, (os.cpu_count() or 2) // 2)
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError:
+        # The TensorFlow runtime is already initialized, e.g. on a Streamlit rerun
+        pass
+
+
+_STOP = object()
+
+
+class _Call:
+    """A queued job that runs an arbitrary function on the executor's thread."""
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class InferenceExecutor:
+    """Owns the model and serves micro-batched predictions to any thread."""
+
+    def __init__(self, model, max_batch_size=256, max_wait_ms=2.0):
+        self.model = model
+        self.n_features = model.inputs[0].shape[-1]
+        # Trace and warm the serving function now so no session pays for it
+        warm_up(model, batch_sizes=(1, max_batch_size))
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='churn-inference', daemon=True)
+        self._worker.start()
+
+    def submit(self, X):
+        """
+        Queue encoded rows for scoring and return a Future of their (n_rows, 1) probabilities.
+
+        Malformed input fails only its own future, never the batch it would have joined.
+        """
+        future = Future()
+        try:
+            X = np.asarray(X, dtype=np.float32)
+        except (TypeError, ValueError) as exc:
+            future.set_exception(exc)
+            return future
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            future.set_exception(ValueError(f"Expected encoded rows of shape (n_rows, {self.n_features}), got {X.shape}"))
+            return future
+        self._queue.put((X, future))
+        return future
+
+    def predict(self, X, timeout=None):
+        return self.submit(X).result(timeout)
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on the executor's thread and return a Future of its result.
+
+        For work that needs the model but isn't a plain prediction, such as
+        scoring a batch-export chunk with attributions. Jobs run in queue order
+        between prediction batches, so keep them chunk-sized.
+        """
+        job = _Call(fn, args, kwargs)
+        self._queue.put(job)
+        return job.future
+
+    def shutdown(self):
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def _predict_batch(self, X):
+        return predict_direct(self.model, X)
+
+    def _run(self):
+        item = None
+        while True:
+            if item is None:
+                item = self._queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, _Call):
+                self._execute(item)
+                item = None
+                continue
+
+            # Collect predictions arriving within max_wait, up to max_batch_size rows;
+            # a job or stop request ends the batch and is handled next
+            batch = [item]
+            rows = len(item[0])
+            item = None
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    queued = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if queued is _STOP or isinstance(queued, _Call):
+                    item = queued
+                    break
+                batch.append(queued)
+                rows += len(queued[0])
+
+            batch = [(X, future) for X, future in batch if future.set_running_or_notify_cancel()]
+            if batch:
+                self._dispatch(batch)
+
+    def _execute(self, job):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(job.fn(*job.args, **job.kwargs))
+        except Exception as exc:
+            job.future.set_exception(exc)
+
+    def _dispatch(self, batch):
+        try:
+            predictions = self._predict_batch(np.concatenate([X for X, _ in batch]))
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+            else:
+                # Retry one request at a time so only the one that fails sees the error
+                for item in batch:
+                    self._dispatch([item])
+            return
+
+        offset = 0
+        for X, future in batch:
+            future.set_result(predictions[offset:offset + len(X)])
+            offset += len(X)
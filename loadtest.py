@@ -0,0 +1,262 @@
+"""
+Concurrent multi-session load test for the Streamlit app.
+
+Starts ``streamlit run app.py`` headless (or targets an already running
+server with --url) and opens N concurrent sessions with a minimal websocket
+client that speaks Streamlit's BackMsg/ForwardMsg protocol, exactly like a
+browser tab. All sessions therefore share the server's ``@st.cache_resource``
+model and inference executor, and every rerun runs on the server's own script
+threads. Every session repeatedly:
+  1. opens the Prediction page and clicks Predict,
+  2. opens the SHAP Analysis page for that prediction,
+  3. loads the Analytics page.
+
+Latency is measured from sending the rerun request to the server's
+script_finished message, so it covers script execution and delta streaming
+but not browser rendering. Memory is the server process's RSS, sampled while
+the sessions are running; an untimed priming session loads the shared model
+first, so the per-session figure excludes that one-off cost.
+
+Usage:
+    python loadtest.py --sessions 1 2 4 8 16 --iterations 3
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import psutil
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.Radio_pb2 import Radio
+
+ACTIONS = ['predict', 'shap', 'analytics']
+PAGES = ["Home", "Prediction", "SHAP Analysis", "Analytics", "Batch Export", "About"]
+
+# Newer Streamlit versions send radio values as the option label, older ones as the index
+RADIO_AS_STRING = 'raw_value' in Radio.DESCRIPTOR.fields_by_name
+
+
+class Session:
+    """One simulated browser tab connected to the Streamlit websocket."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.widgets = {}
+        self.text = []
+
+    async def rerun(self, page, predict=False):
+        """Rerun the script on ``page`` and return (seconds, failed)."""
+        message = BackMsg()
+        message.rerun_script.SetInParent()
+
+        if ('radio', 'Select Page') in self.widgets:
+            state = message.rerun_script.widget_states.widgets.add()
+            state.id = self.widgets[('radio', 'Select Page')]
+            if RADIO_AS_STRING:
+                state.string_value = page
+            else:
+                state.int_value = PAGES.index(page)
+        if predict:
+            state = message.rerun_script.widget_states.widgets.add()
+            state.id = self.widgets[('button', 'Predict Churn Probability')]
+            state.trigger_value = True
+
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        failed = await self._read_until_finished()
+        return time.perf_counter() - start, failed
+
+    async def _read_until_finished(self):
+        failed = False
+        self.text = []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.websocket.recv())
+            kind = message.WhichOneof('type')
+
+            if kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element
+                element_type = element.WhichOneof('type')
+                widget = getattr(element, element_type)
+                if element_type == 'exception':
+                    failed = True
+                elif element_type == 'alert':
+                    self.text.append(widget.body)
+                if getattr(widget, 'id', ''):
+                    self.widgets[(element_type, getattr(widget, 'label', ''))] = widget.id
+            elif kind == 'script_finished':
+                return failed
+
+
+async def run_session(url, iterations, latencies, ready, start):
+    released = False
+    try:
+        async with websockets.connect(url, subprotocols=['streamlit'], max_size=None) as websocket:
+            session = Session(websocket)
+            # Untimed warm-up: load the Home page, then Prediction to learn the widget ids
+            await session.rerun("Home")
+            await session.rerun("Prediction")
+            ready.release()
+            released = True
+            await start.wait()
+            await run_iterations(session, iterations, latencies)
+    finally:
+        # A session that fails during warm-up must not leave run_level waiting forever
+        if not released:
+            ready.release()
+
+
+async def run_iterations(session, iterations, latencies):
+    for _ in range(iterations):
+        seconds, failed = await session.rerun("Prediction", predict=True)
+        latencies.append(('predict', seconds, failed))
+
+        seconds, failed = await session.rerun("SHAP Analysis")
+        # The SHAP page must see this session's prediction
+        failed = failed or not any("Analyzing the last prediction" in text for text in session.text)
+        latencies.append(('shap', seconds, failed))
+
+        seconds, failed = await session.rerun("Analytics")
+        latencies.append(('analytics', seconds, failed))
+
+
+async def sample_rss(process, stop, samples):
+    while not stop.is_set():
+        samples.append(server_rss_mb(process))
+        await asyncio.sleep(0.2)
+
+
+def server_rss_mb(process):
+    """RSS of the server process and its children in MB."""
+    processes = [process] + process.children(recursive=True)
+    return sum(p.memory_info().rss for p in processes if p.is_running()) / (1024 * 1024)
+
+
+async def run_level(url, process, sessions, iterations):
+    """Run ``sessions`` concurrent sessions and summarize their latencies."""
+    rss_before = server_rss_mb(process)
+    latencies = []
+    ready = asyncio.Semaphore(0)
+    start = asyncio.Event()
+
+    tasks = [asyncio.create_task(run_session(url, iterations, latencies, ready, start)) for _ in range(sessions)]
+    for _ in range(sessions):
+        await ready.acquire()
+
+    # Every session is connected and warmed up; release them together
+    samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(process, stop, samples))
+    started = time.perf_counter()
+    start.set()
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        stop.set()
+        await sampler
+    wall_seconds = time.perf_counter() - started
+
+    records = pd.DataFrame(latencies, columns=['action', 'seconds', 'failed'])
+    rss_peak = max(samples + [server_rss_mb(process)])
+
+    row = {'sessions': sessions, 'actions': len(records), 'errors': int(records['failed'].sum())}
+    for action in ACTIONS + ['all']:
+        seconds = records['seconds'] if action == 'all' else records.loc[records['action'] == action, 'seconds']
+        p50, p95, p99 = np.percentile(seconds, [50, 95, 99]) * 1000
+        row.update({f'{action}_p50_ms': p50, f'{action}_p95_ms': p95, f'{action}_p99_ms': p99})
+    row['throughput_actions_per_s'] = len(records) / wall_seconds
+    row['server_rss_peak_mb'] = rss_peak
+    row['rss_per_session_mb'] = max(rss_peak - rss_before, 0) / sessions
+    return row
+
+
+def start_server(app_path, port):
+    """Launch ``streamlit run`` headless and wait for its health check."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', app_path, '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"Streamlit server did not become healthy on port {port}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+async def prime(url):
+    """Run one untimed session so the cached model and executor load before any baseline is taken."""
+    start = asyncio.Event()
+    start.set()
+    await run_session(url, 1, [], asyncio.Semaphore(0), start)
+
+
+async def sweep(url, process, levels, iterations):
+    await prime(url)
+    rows = []
+    for sessions in levels:
+        row = await run_level(url, process, sessions, iterations)
+        rows.append(row)
+        print(f"N={sessions:>3} | p50 {row['all_p50_ms']:8.1f} ms | p95 {row['all_p95_ms']:8.1f} ms | "
+              f"p99 {row['all_p99_ms']:8.1f} ms | {row['throughput_actions_per_s']:6.2f} actions/s | "
+              f"{row['rss_per_session_mb']:6.1f} MB/session | errors {row['errors']}")
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Streamlit app with concurrent websocket sessions")
+    parser.add_argument('--app', default='app.py')
+    parser.add_argument('--url', default=None,
+                        help="Base URL of a running server (e.g. http://localhost:8501); default starts one")
+    parser.add_argument('--server-pid', type=int, default=None, help="PID of the --url server, for memory readings")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help="Concurrency levels to sweep")
+    parser.add_argument('--iterations', type=int, default=3, help="Predict/SHAP/Analytics rounds per session")
+    parser.add_argument('--output', default=None, help="Optional CSV path for the results table")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        if args.server_pid is None:
+            parser.error("--server-pid is required with --url so server memory can be measured")
+        base_url, process = args.url.rstrip('/'), psutil.Process(args.server_pid)
+    else:
+        port = free_port()
+        server = start_server(args.app, port)
+        base_url, process = f'http://localhost:{port}', psutil.Process(server.pid)
+
+    try:
+        url = base_url.replace('http', 'ws', 1) + '/_stcore/stream'
+        report = asyncio.run(sweep(url, process, args.sessions, args.iterations))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        report.to_csv(args.output, index=False)
+
+    print()
+    print(report[['sessions'] + [f'{action}_p95_ms' for action in ACTIONS]].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Shared loading, encoding and batch scoring helpers.
+
+The Streamlit app, the offline tools and any API should all go through these
+functions so that every path encodes customers and applies the decision
+threshold in exactly the same way.
+"""
+import pickle
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from cascade import cascade_predict
+from ensemble import DEFAULT_INTERVAL, ensemble_predict
+from serving import predict_direct
+from threshold import load_threshold
+
+# Raw input fields the model consumes (before encoding)
+INPUT_COLUMNS = [
+    'CreditScore', 'Geography', 'Gender', 'Age', 'Tenure', 'Balance',
+    'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary'
+]
+
+# Numeric columns in the order the scaler was fitted on (Geography one-hot columns follow)
+NUMERIC_COLUMNS = [
+    'CreditScore', 'Gender', 'Age', 'Tenure', 'Balance',
+    'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary'
+]
+
+
+def load_artifacts(model_path='model.h5'):
+    """Load the trained model, encoders and scaler from disk."""
+    model = tf.keras.models.load_model(model_path)
+
+    with open('label_encoder_gender.pkl', 'rb') as file:
+        label_encoder_gender = pickle.load(file)
+
+    with open('onehot_encoder_geo.pkl', 'rb') as file:
+        onehot_encoder_geo = pickle.load(file)
+
+    with open('scaler.pkl', 'rb') as file:
+        scaler = pickle.load(file)
+
+    return model, label_encoder_gender, onehot_encoder_geo, scaler
+
+
+def encode_features(df, label_encoder_gender, onehot_encoder_geo, scaler):
+    """Encode and scale raw customer rows into the model's input matrix."""
+    features = df[NUMERIC_COLUMNS].copy().reset_index(drop=True)
+    features['Gender'] = label_encoder_gender.transform(df['Gender'])
+
+    # One-hot encode Geography
+    geo_encoded = onehot_encoder_geo.transform(df[['Geography']]).toarray()
+    geo_encoded_df = pd.DataFrame(geo_encoded, columns=onehot_encoder_geo.get_feature_names_out(['Geography']))
+
+    features = pd.concat([features, geo_encoded_df], axis=1)
+    return scaler.transform(features).astype(np.float32)
+
+
+def top_attributions(model, X, top_k=3, linear_tier=None, linear_rows=None):
+    """
+    Rank features by gradient x input attribution for every row.
+
+    The scaled inputs are centred on the training mean, so gradient x input
+    approximates each feature's push away from an average customer. The
+    Geography one-hot columns are summed into a single Geography feature.
+    Rows flagged in ``linear_rows`` were scored by the cascade's
+    ``linear_tier`` and are explained by it instead, with the same gradient
+    x input of its probability, p * (1 - p) * coef * x.
+    Returns (names, impacts), each of shape (n_rows, top_k).
+    """
+    X = np.asarray(X, dtype=np.float32)
+    if linear_rows is None:
+        linear_rows = np.zeros(len(X), dtype=bool)
+
+    contributions = np.empty_like(X)
+    if (~linear_rows).any():
+        inputs = tf.convert_to_tensor(X[~linear_rows])
+        with tf.GradientTape() as tape:
+            tape.watch(inputs)
+            probabilities = model(inputs, training=False)
+        contributions[~linear_rows] = (tape.gradient(probabilities, inputs) * inputs).numpy()
+    if linear_rows.any():
+        probabilities = linear_tier.predict_proba(X[linear_rows])[:, 1:]
+        contributions[linear_rows] = probabilities * (1 - probabilities) * linear_tier.coef_[0] * X[linear_rows]
+
+    n_numeric = len(NUMERIC_COLUMNS)
+    grouped = np.column_stack([contributions[:, :n_numeric], contributions[:, n_numeric:].sum(axis=1)])
+    names = np.array(NUMERIC_COLUMNS + ['Geography'])
+
+    order = np.argsort(-np.abs(grouped), axis=1)[:, :top_k]
+    return names[order], np.take_along_axis(grouped, order, axis=1)
+
+
+def risk_labels(probabilities, threshold):
+    """Map churn probabilities to the app's High Risk / Low Risk labels."""
+    return np.where(np.asarray(probabilities) > threshold, 'High Risk', 'Low Risk')
+
+
+def score_customers(df, model, label_encoder_gender, onehot_encoder_geo, scaler,
+                    threshold=None, batch_size=8192, linear_tier=None, band=None,
+                    ensemble=None, interval=DEFAULT_INTERVAL, top_features=0):
+    """
+    Score a DataFrame of raw customer rows.
+
+    Returns a DataFrame with CustomerId (when present), churn_probability,
+    churn_prediction and risk_label, using the tuned decision threshold
+    unless one is passed explicitly. When ``linear_tier`` is given, rows are
+    scored with the cascade and only those inside ``band`` (by default the
+    band routing cascade.DEFAULT_ROUTE_FRACTION of ``df``) reach the ANN.
+    When ``ensemble`` weights are given, churn_probability_mean and
+    churn_probability_lower/upper hold the ensemble's own mean and
+    ``interval`` bounds. churn_probability always comes from the model the
+    decision threshold was tuned on, so it need not fall inside them.
+    ``top_features`` adds that many top_feature_N / top_feature_N_impact
+    attribution columns, taken from whichever tier scored the row.
+    """
+    if threshold is None:
+        threshold = load_threshold()
+
+    routed = None
+    if len(df) == 0:
+        # The encoders and models reject empty input; return the same columns with no rows
+        X = np.empty((0, scaler.n_features_in_), dtype=np.float32)
+        probabilities = np.empty(0, dtype=np.float32)
+    elif linear_tier is not None:
+        X = encode_features(df, label_encoder_gender, onehot_encoder_geo, scaler)
+        probabilities, routed = cascade_predict(X, linear_tier, model, band, threshold, batch_size)
+    else:
+        X = encode_features(df, label_encoder_gender, onehot_encoder_geo, scaler)
+        if len(X) <= batch_size:
+            # Small inputs skip model.predict's per-call loop machinery
+            probabilities = predict_direct(model, X).ravel()
+        else:
+            probabilities = model.predict(X, batch_size=batch_size, verbose=0).ravel()
+
+    result = pd.DataFrame(index=df.index)
+    if 'CustomerId' in df.columns:
+        result['CustomerId'] = df['CustomerId']
+    result['churn_probability'] = probabilities
+    if ensemble is not None:
+        mean, lower, upper = ensemble_predict(X, ensemble, interval)
+        result['churn_probability_mean'] = mean
+        result['churn_probability_lower'] = lower
+        result['churn_probability_upper'] = upper
+    result['churn_prediction'] = (probabilities > threshold).astype(np.int8)
+    result['risk_label'] = risk_labels(probabilities, threshold)
+
+    if top_features:
+        # Explain each row with the tier that actually scored it
+        linear_rows = None if routed is None else ~routed
+        names, impacts = top_attributions(model, X, top_features, linear_tier, linear_rows)
+        for rank in range(top_features):
+            result[f'top_feature_{rank + 1}'] = names[:, rank]
+            result[f'top_feature_{rank + 1}_impact'] = impacts[:, rank]
+    return result
@@ -0,0 +1,141 @@
+"""
+Precompiled serving path for the churn model.
+
+Keras builds and traces ``model.predict``'s function lazily on first use and
+runs its full data-adapter loop on every call, which dominates latency for
+one-row inputs. This module traces the model once into a concrete function
+with a fixed ``(None, n_features)`` float32 input signature, warms it at load
+time, and calls it directly for small batches. The same signature can be
+exported as a SavedModel for other serving stacks.
+
+Usage:
+    python serving.py --benchmark                 # cold vs warm single-row latency
+    python serving.py --export serving_model/     # write a SavedModel
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import tensorflow as tf
+
+# Keyed by the model itself: each traced function closes over its model, so the
+# cache keeps both alive for the life of the process (the apps load one model)
+_serving_functions = {}
+_lock = threading.Lock()
+
+
+def build_serving_function(model):
+    """Trace ``model`` into a concrete function with a fixed input signature."""
+    n_features = model.inputs[0].shape[-1]
+
+    @tf.function(input_signature=[tf.TensorSpec([None, n_features], tf.float32, name='features')])
+    def serve(features):
+        return {'churn_probability': model(features, training=False)}
+
+    return serve.get_concrete_function()
+
+
+def serving_function(model):
+    """Return the cached concrete function for ``model``, building it on first use."""
+    with _lock:
+        if model not in _serving_functions:
+            _serving_functions[model] = build_serving_function(model)
+        return _serving_functions[model]
+
+
+def warm_up(model, batch_sizes=(1, 64)):
+    """Build the serving function and run it once per batch size so the first real call is fast."""
+    serve = serving_function(model)
+    n_features = model.inputs[0].shape[-1]
+    for batch_size in batch_sizes:
+        serve(tf.zeros((batch_size, n_features), tf.float32))
+    return serve
+
+
+def predict_direct(model, X):
+    """Score a small batch through the serving function, bypassing ``model.predict``."""
+    serve = serving_function(model)
+    return serve(tf.convert_to_tensor(X, dtype=tf.float32))['churn_probability'].numpy()
+
+
+def export_saved_model(model, path='serving_model'):
+    tf.saved_model.save(model, path, signatures={'serving_default': serving_function(model)})
+
+
+def _measure(mode, repeats):
+    """Time model loading, the first single-row call and warm calls in this (fresh) process."""
+    from scoring import load_artifacts
+
+    start = time.perf_counter()
+    model = load_artifacts()[0]
+    if mode == 'serving':
+        warm_up(model)
+    load_seconds = time.perf_counter() - start
+
+    row = np.zeros((1, model.inputs[0].shape[-1]), dtype=np.float32)
+    if mode == 'serving':
+        call = lambda: predict_direct(model, row)
+    else:
+        call = lambda: model.predict(row, verbose=0)
+
+    start = time.perf_counter()
+    call()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        warm.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'mode': mode,
+        'load_s': load_seconds,
+        'cold_ms': cold_ms,
+        'warm_p50_ms': float(np.percentile(warm, 50)),
+        'warm_p95_ms': float(np.percentile(warm, 95)),
+    }
+
+
+def benchmark(repeats):
+    # Each mode runs in a fresh interpreter so "cold" really is the first call after loading
+    results = []
+    for mode in ('predict', 'serving'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', mode, '--repeats', str(repeats)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'Path':<22}{'Load (s)':>10}{'Cold (ms)':>12}{'Warm p50 (ms)':>16}{'Warm p95 (ms)':>16}")
+    labels = {'predict': 'model.predict', 'serving': 'warmed serving fn'}
+    for result in results:
+        print(f"{labels[result['mode']]:<22}{result['load_s']:>10.2f}{result['cold_ms']:>12.2f}"
+              f"{result['warm_p50_ms']:>16.3f}{result['warm_p95_ms']:>16.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warmed serving signature for the churn model")
+    parser.add_argument('--benchmark', action='store_true', help="Compare cold and warm single-row latency")
+    parser.add_argument('--export', metavar='PATH', help="Export the serving signature as a SavedModel")
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--measure', choices=['predict', 'serving'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(_measure(args.measure, args.repeats)))
+    elif args.export:
+        from scoring import load_artifacts
+
+        export_saved_model(load_artifacts()[0], args.export)
+        print(f"Saved serving signature to {args.export}")
+    else:
+        benchmark(args.repeats)
+
+
+if __name__ == '__main__':
+    main()
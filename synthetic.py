@@ -0,0 +1,177 @@
+"""
+Synthetic customer generator for load and scale testing.
+
+Learns from Churn_Modelling.csv:
+  * the joint distribution of Geography / Gender / NumOfProducts and the
+    churn rate inside every combination,
+  * per-feature marginals and a Gaussian-copula correlation of the remaining
+    fields, separately for each Geography and churn outcome.
+
+Rows are generated in fixed-size chunks, each seeded from (seed, chunk index),
+so output is reproducible regardless of how many worker processes are used
+and memory stays constant whatever the total size. Every worker streams its
+chunks into its own part file.
+
+Usage:
+    python synthetic.py --rows 100000000 --output synthetic/ --format parquet --workers 8
+"""
+import argparse
+import math
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+COLUMNS = [
+    'RowNumber', 'CustomerId', 'Surname', 'CreditScore', 'Geography', 'Gender', 'Age', 'Tenure',
+    'Balance', 'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary', 'Exited'
+]
+
+# Fields sampled jointly through the per-(Geography, Exited) copula
+COPULA_COLUMNS = ['CreditScore', 'Age', 'Tenure', 'Balance', 'EstimatedSalary', 'HasCrCard', 'IsActiveMember']
+
+CUSTOMER_ID_BASE = 20000000
+
+
+def fit_generator(df):
+    """Learn the marginals, churn rates and correlations used to generate rows."""
+    cells = df.groupby(['Geography', 'Gender', 'NumOfProducts'])['Exited'].agg(['size', 'mean']).reset_index()
+
+    copulas = {}
+    for (geography, exited), group in df.groupby(['Geography', 'Exited']):
+        values = group[COPULA_COLUMNS]
+        # Normal scores of the ranks capture the dependence independently of the marginals
+        ranks = values.rank(method='average').values / (len(values) + 1)
+        correlation = np.corrcoef(ndtri(ranks), rowvar=False)
+        copulas[(geography, exited)] = {
+            'cholesky': np.linalg.cholesky(correlation + 1e-9 * np.eye(len(COPULA_COLUMNS))),
+            'sorted_values': [np.sort(values[column].values) for column in COPULA_COLUMNS],
+        }
+
+    surnames = df['Surname'].value_counts(normalize=True)
+
+    return {
+        'cell_geography': cells['Geography'].values,
+        'cell_gender': cells['Gender'].values,
+        'cell_products': cells['NumOfProducts'].values,
+        'cell_probability': (cells['size'] / cells['size'].sum()).values,
+        'cell_churn_rate': cells['mean'].values,
+        'copulas': copulas,
+        'surnames': surnames.index.values,
+        'surname_probability': surnames.values,
+    }
+
+
+def generate_chunk(spec, n_rows, seed, chunk_index, row_offset):
+    """Generate one chunk of synthetic customers as a DataFrame."""
+    rng = np.random.default_rng([seed, chunk_index])
+
+    cell = rng.choice(len(spec['cell_probability']), n_rows, p=spec['cell_probability'])
+    geography = spec['cell_geography'][cell]
+    exited = (rng.random(n_rows) < spec['cell_churn_rate'][cell]).astype(np.int64)
+
+    sampled = np.empty((n_rows, len(COPULA_COLUMNS)))
+    for (group_geography, group_exited), copula in spec['copulas'].items():
+        mask = (geography == group_geography) & (exited == group_exited)
+        count = int(mask.sum())
+        if not count:
+            continue
+        uniforms = ndtr(rng.standard_normal((count, len(COPULA_COLUMNS))) @ copula['cholesky'].T)
+        # Inverse empirical CDF: reproduces discrete values and the Balance == 0 spike
+        for j, sorted_values in enumerate(copula['sorted_values']):
+            positions = np.minimum((uniforms[:, j] * len(sorted_values)).astype(np.int64), len(sorted_values) - 1)
+            sampled[mask, j] = sorted_values[positions]
+
+    row_numbers = np.arange(row_offset + 1, row_offset + n_rows + 1)
+    chunk = pd.DataFrame({
+        'RowNumber': row_numbers,
+        'CustomerId': CUSTOMER_ID_BASE + row_numbers,
+        'Surname': rng.choice(spec['surnames'], n_rows, p=spec['surname_probability']),
+        'Geography': geography,
+        'Gender': spec['cell_gender'][cell],
+        'NumOfProducts': spec['cell_products'][cell],
+        'Exited': exited,
+    })
+    for j, column in enumerate(COPULA_COLUMNS):
+        chunk[column] = sampled[:, j]
+
+    for column in ['CreditScore', 'Age', 'Tenure', 'HasCrCard', 'IsActiveMember']:
+        chunk[column] = chunk[column].astype(np.int64)
+    return chunk[COLUMNS]
+
+
+def _write_part(spec, chunk_ids, n_rows, chunk_size, seed, path, file_format):
+    """Worker: generate the given chunks in order and stream them into one part file."""
+    writer = None
+    for chunk_index in chunk_ids:
+        row_offset = chunk_index * chunk_size
+        chunk = generate_chunk(spec, min(chunk_size, n_rows - row_offset), seed, chunk_index, row_offset)
+
+        if file_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+        else:
+            chunk.to_csv(path, mode='a' if writer else 'w', header=not writer, index=False)
+            writer = True
+
+    if file_format == 'parquet' and writer is not None:
+        writer.close()
+    return path
+
+
+def generate_dataset(spec, n_rows, output_dir, chunk_size=1000000, workers=None, seed=0, file_format='csv'):
+    """
+    Write ``n_rows`` synthetic customers into ``output_dir`` as part files.
+
+    ``file_format`` is 'csv', 'csv.gz' or 'parquet'. Returns the part paths.
+    """
+    if n_rows <= 0:
+        raise ValueError(f"n_rows must be positive, got {n_rows}")
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count()
+    n_chunks = math.ceil(n_rows / chunk_size)
+    workers = max(1, min(workers, n_chunks))
+
+    # Contiguous chunk ranges per worker keep RowNumber ordered across part files
+    per_worker = math.ceil(n_chunks / workers)
+    tasks = []
+    for worker in range(workers):
+        chunk_ids = range(worker * per_worker, min((worker + 1) * per_worker, n_chunks))
+        if len(chunk_ids):
+            path = os.path.join(output_dir, f"part-{worker:05d}.{file_format}")
+            tasks.append((spec, chunk_ids, n_rows, chunk_size, seed, path, file_format))
+
+    if len(tasks) == 1:
+        return [_write_part(*tasks[0])]
+    with Pool(len(tasks)) as pool:
+        return pool.starmap(_write_part, tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic churn customers at arbitrary scale")
+    parser.add_argument('--source', default='Churn_Modelling.csv', help="Real data to learn distributions from")
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--output', default='synthetic', help="Directory for the part files")
+    parser.add_argument('--format', choices=['csv', 'csv.gz', 'parquet'], default='csv')
+    parser.add_argument('--chunk-size', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    spec = fit_generator(pd.read_csv(args.source))
+    paths = generate_dataset(spec, args.rows, args.output, args.chunk_size, args.workers, args.seed, args.format)
+    print(f"Wrote {args.rows:,} rows to {len(paths)} part file(s) in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from cascade import cascade_predict, uncertainty_band
+
+
+class StubLinearTier:
+    """predict_proba returns the first feature column as the churn probability."""
+
+    def predict_proba(self, X):
+        return np.column_stack([1 - X[:, 0], X[:, 0]])
+
+
+class StubModel:
+    """Scores every row 0.99 and records how many rows it was asked to score."""
+
+    def predict(self, X, batch_size=None, verbose=0):
+        self.rows = len(X)
+        return np.full((len(X), 1), 0.99, dtype=np.float32)
+
+
+@pytest.fixture
+def features():
+    scores = np.linspace(0.0, 1.0, 101, dtype=np.float32)
+    return np.column_stack([scores, np.zeros_like(scores)])
+
+
+def test_only_rows_inside_the_band_reach_the_ann(features):
+    model = StubModel()
+    probabilities, routed = cascade_predict(features, StubLinearTier(), model, band=(0.3, 0.5), threshold=0.4)
+
+    linear_scores = features[:, 0]
+    np.testing.assert_array_equal(routed, (linear_scores >= 0.3) & (linear_scores <= 0.5))
+    assert model.rows == routed.sum()
+    np.testing.assert_allclose(probabilities[routed], 0.99)
+    np.testing.assert_allclose(probabilities[~routed], linear_scores[~routed])
+
+
+def test_band_that_excludes_the_threshold_raises(features):
+    with pytest.raises(ValueError, match="does not contain the decision threshold"):
+        cascade_predict(features, StubLinearTier(), StubModel(), band=(0.5, 0.7), threshold=0.2)
+
+
+def test_default_band_routes_the_requested_fraction_nearest_the_threshold(features):
+    _, routed = cascade_predict(features, StubLinearTier(), StubModel(), threshold=0.2)
+
+    assert routed.mean() == pytest.approx(0.3, abs=0.01)
+    # The routed rows are the ones closest to the threshold
+    distance = np.abs(features[:, 0] - 0.2)
+    assert distance[routed].max() <= distance[~routed].min()
+
+
+def test_fixed_width_band_is_clipped_to_valid_probabilities():
+    assert uncertainty_band(0.2, width=0.25) == pytest.approx((0.0, 0.45))
+    with pytest.raises(ValueError):
+        uncertainty_band(0.2)
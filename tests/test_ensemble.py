@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from ensemble import build_member, ensemble_predict, member_probabilities
+
+
+@pytest.fixture
+def members():
+    tf.keras.utils.set_random_seed(0)
+    models = [build_member(12) for _ in range(3)]
+    names = ['W1', 'b1', 'W2', 'b2', 'W3', 'b3']
+    weights = {name: np.stack(stack).astype(np.float32)
+               for name, stack in zip(names, zip(*[model.get_weights() for model in models]))}
+    return models, weights
+
+
+@pytest.fixture
+def features():
+    return np.random.default_rng(0).normal(size=(50, 12)).astype(np.float32)
+
+
+def test_stacked_pass_matches_each_keras_member(members, features):
+    models, weights = members
+    probabilities = member_probabilities(features, weights)
+
+    assert probabilities.shape == (len(models), len(features))
+    for member, model in enumerate(models):
+        np.testing.assert_allclose(probabilities[member], model(features, training=False).numpy().ravel(),
+                                   rtol=1e-5, atol=1e-6)
+
+
+def test_ensemble_predict_chunks_match_single_pass(members, features):
+    _, weights = members
+    probabilities = member_probabilities(features, weights)
+    mean, lower, upper = ensemble_predict(features, weights, interval=0.9, batch_size=7)
+
+    np.testing.assert_allclose(mean, probabilities.mean(axis=0), rtol=1e-6)
+    np.testing.assert_allclose(lower, np.quantile(probabilities, 0.05, axis=0), rtol=1e-6)
+    np.testing.assert_allclose(upper, np.quantile(probabilities, 0.95, axis=0), rtol=1e-6)
+    assert np.all((lower <= mean) & (mean <= upper))
@@ -0,0 +1,73 @@
+import gzip
+import io
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('tensorflow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from export import read_chunks, stream_csv, stream_parquet
+from scoring import INPUT_COLUMNS, score_customers
+
+
+def prediction_chunks(n_chunks=3, rows=4):
+    for chunk in range(n_chunks):
+        ids = np.arange(chunk * rows, (chunk + 1) * rows)
+        probabilities = (ids / 100).astype(np.float32)
+        yield pd.DataFrame({
+            'CustomerId': ids,
+            'churn_probability': probabilities,
+            'churn_prediction': (probabilities > 0.05).astype(np.int8),
+            'risk_label': np.where(probabilities > 0.05, 'High Risk', 'Low Risk'),
+        })
+
+
+def expected_table():
+    return pd.concat(prediction_chunks(), ignore_index=True)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_csv_stream_round_trips_with_a_single_header(compress):
+    data = b''.join(stream_csv(prediction_chunks(), compress=compress))
+    if compress:
+        data = gzip.decompress(data)
+
+    assert data.decode('utf-8').count('CustomerId') == 1
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(data)), expected_table(), check_dtype=False)
+
+
+def test_parquet_stream_round_trips_one_row_group_per_chunk():
+    pieces = list(stream_parquet(prediction_chunks()))
+    data = b''.join(pieces)
+    parquet_file = pq.ParquetFile(io.BytesIO(data))
+
+    assert parquet_file.metadata.num_row_groups == 3
+    # Bytes are drained as each row group is written, not only when the writer closes
+    assert len(pieces) > 1
+    pd.testing.assert_frame_equal(parquet_file.read().to_pandas(), expected_table(), check_dtype=False)
+
+
+def test_empty_parquet_source_yields_one_empty_chunk(tmp_path):
+    path = tmp_path / 'customers.parquet'
+    pd.DataFrame({column: pd.Series(dtype=float) for column in INPUT_COLUMNS}).to_parquet(path)
+
+    chunks = list(read_chunks(str(path)))
+    assert len(chunks) == 1
+    assert chunks[0].empty and chunks[0].columns.tolist() == INPUT_COLUMNS
+
+
+def test_header_only_input_scores_to_empty_predictions():
+    empty = pd.DataFrame(columns=['CustomerId'] + INPUT_COLUMNS)
+    scaler = SimpleNamespace(n_features_in_=12)
+
+    result = score_customers(empty, None, None, None, scaler, threshold=0.5, top_features=2)
+
+    assert result.empty
+    assert result.columns.tolist() == ['CustomerId', 'churn_probability', 'churn_prediction', 'risk_label',
+                                       'top_feature_1', 'top_feature_1_impact',
+                                       'top_feature_2', 'top_feature_2_impact']
+    csv = b''.join(stream_csv([result])).decode('utf-8')
+    assert csv.strip() == ','.join(result.columns)
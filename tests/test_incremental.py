@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import incremental
+
+
+def stub_score_customers(df, *artifacts, threshold=0.5, **kwargs):
+    """Deterministic stand-in for the model: churn probability is Age / 100."""
+    stub_score_customers.scored.extend(df['CustomerId'])
+    probabilities = df['Age'].values / 100
+    return pd.DataFrame({
+        'CustomerId': df['CustomerId'],
+        'churn_probability': probabilities,
+        'churn_prediction': (probabilities > threshold).astype(np.int8),
+        'risk_label': np.where(probabilities > threshold, 'High Risk', 'Low Risk'),
+    }, index=df.index)
+
+
+@pytest.fixture
+def version(monkeypatch):
+    state = {'version': 'v1'}
+    monkeypatch.setattr(incremental, 'model_version', lambda *args, **kwargs: state['version'])
+    monkeypatch.setattr(incremental, 'score_customers', stub_score_customers)
+    stub_score_customers.scored = []
+    return state
+
+
+@pytest.fixture
+def snapshot():
+    return pd.DataFrame({
+        'CustomerId': [101, 102, 103, 104],
+        'CreditScore': [600, 650, 700, 750],
+        'Geography': ['France', 'Spain', 'Germany', 'France'],
+        'Gender': ['Male', 'Female', 'Female', 'Male'],
+        'Age': [30, 45, 60, 52],
+        'Tenure': [1, 2, 3, 4],
+        'Balance': [0.0, 1000.0, 2000.0, 3000.0],
+        'NumOfProducts': [1, 2, 1, 2],
+        'HasCrCard': [1, 0, 1, 0],
+        'IsActiveMember': [0, 1, 0, 1],
+        'EstimatedSalary': [50000.0, 60000.0, 70000.0, 80000.0],
+    })
+
+
+def rescore(snapshot, store, threshold=0.5):
+    stub_score_customers.scored = []
+    result, rescored, _ = incremental.rescore_incremental(snapshot, store, artifacts=(), threshold=threshold,
+                                                          batch_size=2)
+    return result, rescored
+
+
+def test_first_run_scores_everyone_in_snapshot_order(version, snapshot):
+    result, rescored = rescore(snapshot, None)
+
+    assert rescored == 4
+    assert result['CustomerId'].tolist() == [101, 102, 103, 104]
+    np.testing.assert_allclose(result['churn_probability'], [0.30, 0.45, 0.60, 0.52])
+
+
+def test_unchanged_snapshot_rescores_nothing(version, snapshot):
+    store, _ = rescore(snapshot, None)
+    result, rescored = rescore(snapshot, store)
+
+    assert rescored == 0
+    assert stub_score_customers.scored == []
+    pd.testing.assert_frame_equal(result, store)
+
+
+def test_only_new_and_changed_rows_are_rescored(version, snapshot):
+    store, _ = rescore(snapshot, None)
+
+    updated = snapshot[snapshot['CustomerId'] != 102].copy()
+    updated.loc[updated['CustomerId'] == 103, 'Age'] = 20
+    new_customer = snapshot.iloc[[0]].assign(CustomerId=105, Age=80)
+    updated = pd.concat([new_customer, updated], ignore_index=True)
+
+    result, rescored = rescore(updated, store)
+
+    assert rescored == 2
+    assert sorted(stub_score_customers.scored) == [103, 105]
+    # Deleted customer 102 is gone and rows follow the new snapshot's order
+    assert result['CustomerId'].tolist() == [105, 101, 103, 104]
+    np.testing.assert_allclose(result['churn_probability'], [0.80, 0.30, 0.20, 0.52])
+    carried = store.set_index('CustomerId').loc[[101, 104], 'scored_at']
+    assert result.set_index('CustomerId').loc[[101, 104], 'scored_at'].tolist() == carried.tolist()
+
+
+def test_model_version_bump_rescores_everyone(version, snapshot):
+    store, _ = rescore(snapshot, None)
+    version['version'] = 'v2'
+
+    result, rescored = rescore(snapshot, store)
+
+    assert rescored == 4
+    assert (result['model_version'] == 'v2').all()
+
+
+def test_int_to_float_dtype_change_does_not_rescore(version, snapshot):
+    store, _ = rescore(snapshot, None)
+    as_float = snapshot.astype({column: np.float64 for column in ['CreditScore', 'Age', 'Tenure', 'NumOfProducts',
+                                                                  'HasCrCard', 'IsActiveMember']})
+
+    _, rescored = rescore(as_float, store)
+
+    assert rescored == 0
+
+
+def test_store_round_trip_through_csv(version, snapshot, tmp_path):
+    store, _ = rescore(snapshot, None)
+    path = str(tmp_path / 'scores.csv')
+    incremental.write_table(store, path)
+
+    _, rescored = rescore(snapshot, incremental.read_table(path))
+
+    assert rescored == 0
+
+
+def test_retuned_threshold_relabels_without_rescoring(version, snapshot):
+    store, _ = rescore(snapshot, None, threshold=0.5)
+    result, rescored = rescore(snapshot, store, threshold=0.4)
+
+    assert rescored == 0
+    assert result['risk_label'].tolist() == ['Low Risk', 'High Risk', 'High Risk', 'High Risk']
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from ensemble import build_member
+from inference import InferenceExecutor
+
+
+class RecordingExecutor(InferenceExecutor):
+    """Records each forward pass and rejects any batch containing a NaN."""
+
+    def _predict_batch(self, X):
+        self.batches.append(len(X))
+        if np.isnan(X).any():
+            raise FloatingPointError("NaN in batch")
+        return super()._predict_batch(X)
+
+
+@pytest.fixture
+def model():
+    tf.keras.utils.set_random_seed(0)
+    return build_member(12)
+
+
+@pytest.fixture
+def executor(model):
+    # A long wait so requests submitted back to back land in one micro-batch
+    executor = RecordingExecutor(model, max_batch_size=64, max_wait_ms=200)
+    executor.batches = []
+    yield executor
+    executor.shutdown()
+
+
+def rows(n, seed):
+    return np.random.default_rng(seed).normal(size=(n, 12)).astype(np.float32)
+
+
+def test_batched_results_are_split_back_to_each_request(model, executor):
+    requests = [rows(n, seed) for seed, n in enumerate([1, 3, 2, 5])]
+    futures = [executor.submit(X) for X in requests]
+
+    for X, future in zip(requests, futures):
+        np.testing.assert_allclose(future.result(5), model(X, training=False).numpy(), rtol=1e-5, atol=1e-6)
+    assert executor.batches == [11]
+
+
+def test_malformed_request_fails_only_its_own_future(executor):
+    good = executor.submit(rows(1, 0))
+    bad = executor.submit(rows(1, 1)[:, :5])
+
+    with pytest.raises(ValueError):
+        bad.result(5)
+    assert good.result(5).shape == (1, 1)
+
+
+def test_failed_batch_is_retried_per_request(executor):
+    poisoned = rows(2, 0)
+    poisoned[1, 3] = np.nan
+    futures = [executor.submit(rows(1, 1)), executor.submit(poisoned), executor.submit(rows(3, 2))]
+
+    with pytest.raises(FloatingPointError):
+        futures[1].result(5)
+    assert futures[0].result(5).shape == (1, 1)
+    assert futures[2].result(5).shape == (3, 1)
+    assert executor.batches == [6, 1, 2, 3]
+
+
+def test_call_runs_jobs_and_propagates_exceptions(executor):
+    assert executor.call(sum, [1, 2, 3]).result(5) == 6
+
+    with pytest.raises(ZeroDivisionError):
+        executor.call(lambda: 1 / 0).result(5)
+    # The worker keeps serving after a failed job
+    assert executor.predict(rows(1, 0), timeout=5).shape == (1, 1)
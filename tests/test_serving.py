@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from ensemble import build_member
+from serving import predict_direct, serving_function
+
+
+@pytest.fixture(scope='module')
+def model():
+    tf.keras.utils.set_random_seed(0)
+    return build_member(12)
+
+
+# score_customers sends every batch of up to 8192 rows through predict_direct
+@pytest.mark.parametrize('n_rows', [1, 37, 8192])
+def test_predict_direct_matches_model_predict(model, n_rows):
+    X = np.random.default_rng(n_rows).normal(size=(n_rows, 12)).astype(np.float32)
+
+    direct = predict_direct(model, X)
+
+    assert direct.shape == (n_rows, 1)
+    np.testing.assert_allclose(direct, model.predict(X, verbose=0), rtol=1e-5, atol=1e-6)
+
+
+def test_serving_function_is_built_once_per_model(model):
+    assert serving_function(model) is serving_function(model)
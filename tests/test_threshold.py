@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from sklearn.metrics import average_precision_score, roc_auc_score, roc_curve
+
+from threshold import compute_curves, load_threshold, summarize_curves
+
+
+@pytest.fixture
+def holdout():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 2000)
+    # Rounded scores so the curves have to handle ties
+    y_score = np.round(np.clip(0.3 * y_true + rng.random(2000) * 0.7, 0, 1), 2)
+    return y_true, y_score
+
+
+def brute_force_net_benefit(y_true, y_score, threshold, retention_cost, customer_value, save_rate):
+    targeted = y_score > threshold
+    value = np.broadcast_to(customer_value, y_score.shape)
+    return (y_true * value)[targeted].sum() * save_rate - targeted.sum() * retention_cost
+
+
+def test_roc_points_match_sklearn(holdout):
+    y_true, y_score = holdout
+    curves = compute_curves(y_true, y_score)
+    fpr, tpr, _ = roc_curve(y_true, y_score, drop_intermediate=False)
+
+    np.testing.assert_allclose(curves['fpr'], fpr)
+    np.testing.assert_allclose(curves['tpr'], tpr)
+
+
+def test_summary_auc_and_average_precision_match_sklearn(holdout):
+    y_true, y_score = holdout
+    summary = summarize_curves(compute_curves(y_true, y_score))
+
+    assert summary['roc_auc'] == pytest.approx(roc_auc_score(y_true, y_score))
+    assert summary['average_precision'] == pytest.approx(average_precision_score(y_true, y_score))
+
+
+@pytest.mark.parametrize('per_customer_value', [False, True])
+def test_net_benefit_matches_brute_force(holdout, per_customer_value):
+    y_true, y_score = holdout
+    customer_value = np.linspace(100, 5000, len(y_true)) if per_customer_value else 1000.0
+    curves = compute_curves(y_true, y_score, retention_cost=50, customer_value=customer_value, save_rate=0.3)
+
+    expected = [brute_force_net_benefit(y_true, y_score, t, 50, customer_value, 0.3) for t in curves['threshold']]
+    np.testing.assert_allclose(curves['net_benefit'], expected)
+    np.testing.assert_array_equal(curves['targeted'], [(y_score > t).sum() for t in curves['threshold']])
+
+
+def test_summary_picks_best_threshold(holdout):
+    y_true, y_score = holdout
+    summary = summarize_curves(compute_curves(y_true, y_score, retention_cost=50, customer_value=1000, save_rate=0.3))
+
+    candidates = np.r_[np.unique(y_score), 1.0] - 1e-9
+    best = max(brute_force_net_benefit(y_true, y_score, t, 50, 1000, 0.3) for t in candidates)
+    assert summary['expected_net_benefit'] == pytest.approx(best)
+    assert summary['targeted'] == (y_score > summary['threshold']).sum()
+
+
+def test_load_threshold_defaults_when_missing(tmp_path):
+    assert load_threshold(tmp_path / 'missing.json') == 0.5
@@ -0,0 +1,196 @@
+"""
+Cost-aware decision threshold tuning.
+
+Scores a labeled holdout once, then builds the full ROC and precision-recall
+curves together with the expected retention cost and benefit at every
+distinct threshold. Everything is derived from a single sort followed by
+cumulative sums, so it stays fast on multi-million-row holdouts.
+
+The chosen threshold is written to threshold.json and picked up by the
+Prediction page and the batch scoring helpers through load_threshold().
+
+Usage:
+    python threshold.py --data Churn_Modelling.csv --retention-cost 50 --customer-value 1000 --save-rate 0.3
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+THRESHOLD_PATH = 'threshold.json'
+DEFAULT_THRESHOLD = 0.5
+
+
+def load_threshold(path=THRESHOLD_PATH, default=DEFAULT_THRESHOLD):
+    """Return the tuned decision threshold, or the 0.5 default if none has been saved."""
+    if not os.path.exists(path):
+        return default
+    with open(path) as file:
+        return float(json.load(file)['threshold'])
+
+
+def save_threshold(summary, path=THRESHOLD_PATH):
+    with open(path, 'w') as file:
+        json.dump(summary, file, indent=2)
+
+
+def compute_curves(y_true, y_score, retention_cost=50.0, customer_value=1000.0, save_rate=0.3):
+    """
+    Compute ROC, precision-recall and retention economics at every threshold.
+
+    A customer is targeted when its score is strictly greater than the
+    threshold (matching the app's ``probability > threshold`` rule). Targeting
+    costs ``retention_cost`` per customer; a targeted churner is saved with
+    probability ``save_rate`` and is then worth ``customer_value``.
+    ``customer_value`` may be a scalar or a per-customer array.
+
+    Returns a DataFrame with one row per distinct threshold, ordered from
+    "target nobody" to "target everybody".
+    """
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    y_score = np.asarray(y_score, dtype=np.float64).ravel()
+    value = np.broadcast_to(np.asarray(customer_value, dtype=np.float64), y_score.shape)
+
+    # One sort, highest score first; stable so ties keep their input order
+    order = np.argsort(-y_score, kind='mergesort')
+    y_score = y_score[order]
+    y_true = y_true[order]
+    value = value[order]
+
+    # Last index of every run of tied scores -- one curve point per distinct score
+    distinct = np.flatnonzero(np.diff(y_score))
+    idx = np.r_[distinct, y_score.size - 1]
+
+    tps = np.cumsum(y_true)[idx]
+    fps = (idx + 1) - tps
+    saved_value = np.cumsum(y_true * value)[idx] * save_rate
+
+    # Threshold halfway to the next lower distinct score so '>' selects exactly this prefix
+    scores = y_score[idx]
+    thresholds = np.r_[(scores[:-1] + scores[1:]) / 2, np.nextafter(scores[-1], -np.inf)]
+
+    # Prepend the "target nobody" operating point
+    tps = np.r_[0.0, tps]
+    fps = np.r_[0.0, fps]
+    saved_value = np.r_[0.0, saved_value]
+    thresholds = np.r_[max(1.0, scores[0]), thresholds]
+
+    positives = tps[-1]
+    negatives = fps[-1]
+    targeted = tps + fps
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tpr = tps / positives if positives else np.zeros_like(tps)
+        fpr = fps / negatives if negatives else np.zeros_like(fps)
+        precision = np.where(targeted > 0, tps / targeted, 1.0)
+
+    cost = targeted * retention_cost
+
+    return pd.DataFrame({
+        'threshold': thresholds,
+        'targeted': targeted.astype(np.int64),
+        'true_positives': tps.astype(np.int64),
+        'false_positives': fps.astype(np.int64),
+        'tpr': tpr,
+        'fpr': fpr,
+        'precision': precision,
+        'recall': tpr,
+        'retention_cost': cost,
+        'retention_benefit': saved_value,
+        'net_benefit': saved_value - cost,
+    })
+
+
+def summarize_curves(curves):
+    """Pick the threshold with the highest expected net benefit and attach curve summaries."""
+    best = curves.iloc[int(curves['net_benefit'].values.argmax())]
+
+    tpr = curves['tpr'].values
+    roc_auc = float(np.sum(np.diff(curves['fpr'].values) * (tpr[1:] + tpr[:-1]) / 2))
+    recall = curves['recall'].values
+    average_precision = float(np.sum(np.diff(recall) * curves['precision'].values[1:]))
+
+    return {
+        'threshold': float(np.clip(best['threshold'], 0.0, 1.0)),
+        'expected_net_benefit': float(best['net_benefit']),
+        'expected_retention_cost': float(best['retention_cost']),
+        'expected_retention_benefit': float(best['retention_benefit']),
+        'targeted': int(best['targeted']),
+        'precision': float(best['precision']),
+        'recall': float(best['recall']),
+        'roc_auc': roc_auc,
+        'average_precision': average_precision,
+    }
+
+
+def holdout_split(df, test_size=0.2, random_state=42):
+    """Reproduce the train/test split used in experiments.ipynb and return the test rows."""
+    from sklearn.model_selection import train_test_split
+
+    _, holdout = train_test_split(df, test_size=test_size, random_state=random_state)
+    return holdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the churn decision threshold on a labeled holdout")
+    parser.add_argument('--data', default='Churn_Modelling.csv', help="Labeled CSV with an Exited column")
+    parser.add_argument('--no-split', action='store_true',
+                        help="Use every row of --data as the holdout instead of the notebook's 20%% test split")
+    parser.add_argument('--retention-cost', type=float, default=50.0, help="Cost of one retention action")
+    parser.add_argument('--customer-value', type=float, default=1000.0,
+                        help="Value of a retained customer (ignored when --value-column is set)")
+    parser.add_argument('--value-column', default=None, help="Per-customer value column, e.g. Balance")
+    parser.add_argument('--save-rate', type=float, default=0.3,
+                        help="Probability a targeted churner is retained")
+    parser.add_argument('--curves-out', default=None, help="Optional CSV path for the full curves")
+    parser.add_argument('--output', default=THRESHOLD_PATH, help="Where to write the chosen threshold")
+    args = parser.parse_args()
+
+    from scoring import encode_features, load_artifacts
+
+    model, label_encoder_gender, onehot_encoder_geo, scaler = load_artifacts()
+
+    df = pd.read_csv(args.data)
+    if not args.no_split:
+        df = holdout_split(df)
+
+    # Score the holdout once
+    start = time.perf_counter()
+    X = encode_features(df, label_encoder_gender, onehot_encoder_geo, scaler)
+    y_score = model.predict(X, batch_size=8192, verbose=0).ravel()
+    score_seconds = time.perf_counter() - start
+
+    customer_value = df[args.value_column].values if args.value_column else args.customer_value
+
+    start = time.perf_counter()
+    curves = compute_curves(df['Exited'].values, y_score, args.retention_cost, customer_value, args.save_rate)
+    summary = summarize_curves(curves)
+    curve_seconds = time.perf_counter() - start
+
+    summary.update({
+        'retention_cost': args.retention_cost,
+        'customer_value': args.value_column or args.customer_value,
+        'save_rate': args.save_rate,
+        'holdout_rows': int(len(df)),
+    })
+    save_threshold(summary, args.output)
+
+    if args.curves_out:
+        curves.to_csv(args.curves_out, index=False)
+
+    print(f"Scored {len(df):,} holdout rows in {score_seconds:.2f}s; "
+          f"curves over {len(curves):,} thresholds in {curve_seconds:.3f}s")
+    print(f"ROC AUC: {summary['roc_auc']:.4f} | Average precision: {summary['average_precision']:.4f}")
+    print(f"Chosen threshold: {summary['threshold']:.4f} "
+          f"(precision {summary['precision']:.1%}, recall {summary['recall']:.1%}, "
+          f"targets {summary['targeted']:,} customers)")
+    print(f"Expected net benefit: {summary['expected_net_benefit']:,.0f} "
+          f"(benefit {summary['expected_retention_benefit']:,.0f} - cost {summary['expected_retention_cost']:,.0f})")
+    print(f"Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()